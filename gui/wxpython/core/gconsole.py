@@ -47,6 +47,7 @@ from grass.pydispatch.signal import Signal
 from core import globalvar
 from core.gcmd import CommandThread, GError, GException
 from gui_core.forms import GUI
+from gui_core import gselect
 from core.debug import Debug
 from core.settings import UserSettings
 from core.giface import Notification
@@ -684,6 +685,9 @@ class GConsole(wx.EvtHandler):
         self.WriteCmdLog('(%s) %s (%s)' % (str(time.ctime()), msg, stime),
                          notification=event.notification)
 
+        # command could create or remove maps
+        gselect.InvalidateCache()
+
         if event.onDone:
             event.onDone(event)
 
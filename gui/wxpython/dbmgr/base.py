@@ -58,6 +58,7 @@ from dbmgr.sqlbuilder import SQLBuilderSelect, SQLBuilderUpdate
 from core.gcmd import RunCommand, GException, GError, GMessage, GWarning
 from core.utils import ListOfCatsToRange
 from gui_core.dialogs import CreateNewVector
+from gui_core import gselect
 from dbmgr.vinfo import VectorDBInfo, GetUnicodeValue, CreateDbInfoDesc
 from core.debug import Debug
 from dbmgr.dialogs import ModifyTableRecord, AddColumnDialog
@@ -955,6 +956,7 @@ class DbMgrNotebookBase(FN.FlatNotebook):
                            quiet=True,
                            parent=self,
                            **cmd[1])
+            gselect.InvalidateCache()
 
             self.dbMgrData['mapDBInfo'] = VectorDBInfo(
                 self.dbMgrData['vectName'])
@@ -3637,6 +3639,7 @@ class LayerBook(wx.Notebook):
                        qlayer=layer,
                        option='cat',
                        columns=key)
+        gselect.InvalidateCache()
 
         if ret == 0:
             # update dialog (only for new layer)
@@ -3685,6 +3688,7 @@ class LayerBook(wx.Notebook):
             tableList = self.addLayerWidgets['table'][1]
             tableList.SetItems(self._getTables(driver, database))
             tableList.SetStringSelection(table)
+        gselect.InvalidateCache()
 
         # update dialog
         self.parentDialog.parentDbMgrBase.UpdateDialog(layer=layer)
@@ -3762,6 +3766,7 @@ class LayerBook(wx.Notebook):
                 table=self.modifyLayerWidgets['table'][1].GetStringSelection(),
                 key=self.modifyLayerWidgets['key'][1].GetStringSelection(),
                 layer=int(layer))
+            gselect.InvalidateCache()
 
             # update dialog (only for new layer)
             self.parentDialog.parentDbMgrBase.UpdateDialog(layer=layer)
@@ -47,7 +47,15 @@ import os
 import sys
 import glob
 import copy
+import time
 import six
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+try:
+    from subprocess import DEVNULL as _DEVNULL
+except ImportError:
+    # Python 2, kept open for the lifetime of the process
+    _DEVNULL = open(os.devnull, 'w')
 
 import wx
 
@@ -76,6 +84,267 @@ from gui_core.wrap import TreeCtrl, Button, StaticText, StaticBox, \
 
 from grass.pydispatch.signal import Signal
 
+# g.list output shared by all element selects, see _listGrouped()
+_LIST_CACHE = {}
+# increased by InvalidateCache(), element trees are rebuilt when changed
+_CACHE_GENERATION = 0
+
+# topology information of vector maps, see _getVectorTopo()
+_VECTOR_TOPO_CACHE = {}
+
+# recently used descriptions of attribute tables, see _getVectorDBInfo()
+_VDB_CACHE = OrderedDict()
+_VDB_CACHE_MAX = 8
+
+# lists of locations and mapsets with modification time of directory,
+# see _getListOfLocations() and _getListOfMapsets()
+_LOCATIONS_CACHE = {}
+_MAPSETS_CACHE = {}
+
+# thread shared by all selects, see _getThread()
+_THREAD = None
+
+# text colour of mapset and group nodes in element tree
+_NODE_COLOUR = wx.Colour(50, 50, 200)
+
+# map element types to g.list types
+_ELEMENT_DICT = {'cell': 'raster',
+                 'raster': 'raster',
+                 'grid3': 'raster_3d',
+                 'raster_3d': 'raster_3d',
+                 'vector': 'vector',
+                 'paint/labels': 'label',
+                 'label': 'label',
+                 'windows': 'region',
+                 'region': 'region',
+                 'group': 'group',
+                 'stds': 'stds',
+                 'strds': 'strds',
+                 'str3ds': 'str3ds',
+                 'stvds': 'stvds'}
+
+
+def _listGrouped(types, gisenv, ttl=5.0):
+    """List elements grouped by mapsets, cached for given time
+
+    :param list types: element types passed to g.list
+    :param dict gisenv: GRASS environment (see grass.gisenv())
+    :param float ttl: max age of cached result in seconds
+
+    :return: dictionary of mapsets/elements (see _sortGrouped())
+    """
+    key = (gisenv['GISDBASE'], gisenv['LOCATION_NAME'], gisenv['MAPSET'],
+           tuple(types))
+    now = time.time()
+    cached = _LIST_CACHE.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+
+    # InvalidateCache() can be called while listing in a thread
+    generation = _CACHE_GENERATION
+    filesdict = _sortGrouped(
+        grass.list_grouped(types, check_search_path=False))
+    if generation == _CACHE_GENERATION:
+        _LIST_CACHE[key] = (now, filesdict)
+
+    return filesdict
+
+
+def _getElementKinds(element):
+    """Get g.list types for element type(s)
+
+    :param str element: element type or comma separated types
+                        (see _ELEMENT_DICT)
+
+    :return: list of g.list types or None for not selectable element
+    """
+    kinds = []
+    for elem in element.split(','):
+        kind = _ELEMENT_DICT.get(elem)
+        if kind is None:
+            return None
+        kinds.append(kind)
+
+    return kinds
+
+
+def _sortGrouped(filesdict):
+    """Sort lists of elements grouped by mapsets (and element types)
+
+    :param dict filesdict: dictionary of mapsets/elements
+
+    :return: dictionary of mapsets/elements given as sorted tuples
+    """
+    result = {}
+    for mapset, elements in six.iteritems(filesdict):
+        if isinstance(elements, dict):
+            result[mapset] = dict(
+                (etype, tuple(grass.natural_sort(elist)))
+                for etype, elist in six.iteritems(elements))
+        else:
+            result[mapset] = tuple(grass.natural_sort(elements))
+
+    return result
+
+
+def _getLocation(gisenv=None):
+    """Get GRASS database and location used as a part of cache keys
+
+    :param dict gisenv: GRASS environment (see grass.gisenv()),
+                        None to get the current one
+
+    :return: tuple (GISDBASE, LOCATION_NAME)
+    """
+    if gisenv is None:
+        gisenv = grass.gisenv()
+    return gisenv['GISDBASE'], gisenv['LOCATION_NAME']
+
+
+def _getVectorTopo(vector, location, ttl=5.0):
+    """Get topology information of vector map, cached for given time
+
+    :param str vector: fully qualified vector map name
+    :param tuple location: GRASS database and location (see _getLocation())
+    :param float ttl: max age of cached information in seconds
+
+    :return: dictionary of topology information (see
+             grass.vector_info_topo())
+    """
+    key = location + (vector,)
+    now = time.time()
+    cached = _VECTOR_TOPO_CACHE.get(key)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+
+    topo = grass.vector_info_topo(vector)
+    _VECTOR_TOPO_CACHE[key] = (now, topo)
+
+    return topo
+
+
+def _isMapsetExpanded(sel, mapset, curr_mapset):
+    """Check if mapset branch is expanded when element tree is built
+
+    :param int sel: value of elementListExpand setting
+    :param str mapset: mapset name
+    :param str curr_mapset: current mapset name
+    """
+    if sel == 0:  # collapse all except PERMANENT and current
+        return mapset in ('PERMANENT', curr_mapset)
+    elif sel == 1:  # collapse all except PERMANENT
+        return mapset == 'PERMANENT'
+    elif sel == 2:  # collapse all except current
+        return mapset == curr_mapset
+    elif sel == 4:  # expand all
+        return True
+
+    return False  # collapse all
+
+
+def _getVectorDBInfo(vector, ttl=5.0):
+    """Get description of attribute tables linked to a vector map
+
+    Recently used descriptions are reused for given time.
+
+    :param str vector: vector map name
+    :param float ttl: max age of cached description in seconds
+
+    :return: VectorDBInfo instance
+    """
+    key = _getLocation() + (vector,)
+    now = time.time()
+    cached = _VDB_CACHE.pop(key, None)
+    if cached and now - cached[0] < ttl:
+        dbInfo = cached[1]
+    else:
+        dbInfo = VectorDBInfo(vector)
+        cached = (now, dbInfo)
+        if len(_VDB_CACHE) >= _VDB_CACHE_MAX:
+            _VDB_CACHE.popitem(last=False)
+    _VDB_CACHE[key] = cached
+
+    return dbInfo
+
+
+def _getCachedListing(cache, key, path, function, *args, **kwargs):
+    """Call function listing given directory unless the directory was
+    not modified since the last call and the result is not too old
+
+    Validity of listed entries depends on files in their directories
+    (e.g. WIND of mapset) which do not change modification time of the
+    listed directory, hence the result expires also after given time.
+
+    :param dict cache: dictionary for results
+    :param key: key of the result in cache
+    :param str path: path to directory
+    :param function: listing function
+    :param args: arguments of function
+    :param float ttl: max age of cached result in seconds (keyword only)
+
+    :return: copy of the cached list
+    """
+    ttl = kwargs.get('ttl', 5.0)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        cache.pop(key, None)
+        return function(*args)
+
+    now = time.time()
+    cached = cache.get(key)
+    if not cached or cached[0] != mtime or now - cached[1] >= ttl:
+        cached = cache[key] = (mtime, now, function(*args))
+
+    return list(cached[2])
+
+
+def _getListOfLocations(gisdbase):
+    """Get list of locations in GRASS database (see GetListOfLocations())
+
+    The list is cached for a short time unless GRASS database directory
+    is modified.
+    """
+    return _getCachedListing(_LOCATIONS_CACHE, gisdbase, gisdbase,
+                             GetListOfLocations, gisdbase)
+
+
+def _getListOfMapsets(gisdbase, location):
+    """Get list of all mapsets in location (see GetListOfMapsets())
+
+    The list is cached for a short time unless location directory is
+    modified.
+    """
+    return _getCachedListing(_MAPSETS_CACHE, (gisdbase, location),
+                             os.path.join(gisdbase, location),
+                             GetListOfMapsets, gisdbase, location)
+
+
+def _getThread():
+    """Get thread for listing elements, created on first use
+
+    The thread is shared by all selects, results are matched by request
+    ids returned by gThread.Run().
+    """
+    global _THREAD
+    if _THREAD is None:
+        from core.gthread import gThread
+        _THREAD = gThread()
+    return _THREAD
+
+
+def InvalidateCache():
+    """Clear cached lists of elements, topology information of vector
+    maps and descriptions of attribute tables
+
+    Should be called when maps are created, renamed, removed or
+    modified or when attribute tables are changed.
+    """
+    global _CACHE_GENERATION
+    _LIST_CACHE.clear()
+    _VECTOR_TOPO_CACHE.clear()
+    _VDB_CACHE.clear()
+    _CACHE_GENERATION += 1
+
 
 class Select(ComboCtrl):
 
@@ -165,6 +434,12 @@ class Select(ComboCtrl):
                          multiple=multiple, nmaps=nmaps,
                          updateOnPopup=updateOnPopup, onPopup=onPopup)
 
+    @staticmethod
+    def InvalidateCache():
+        """Clear cached information about elements, see
+        InvalidateCache()"""
+        InvalidateCache()
+
 
 class VectorSelect(Select):
 
@@ -185,8 +460,10 @@ class VectorSelect(Select):
 
     def _isElement(self, vectorName):
         """Check if element should be filtered out"""
+        location = self.tcp.location or _getLocation()
+        topo = _getVectorTopo(vectorName, location)
         try:
-            if int(grass.vector_info_topo(vectorName)[self.ftype]) < 1:
+            if int(topo[self.ftype]) < 1:
                 return False
         except KeyError:
             return False
@@ -211,8 +488,10 @@ class ListCtrlComboPopup(ComboPopup):
         self.curitem = None
         self.multiple = False
         self.updateOnPopup = True
-        self.filterItems = []      # limit items based on this list,
+        self.filterItems = set()   # limit items based on this set,
         # see layerTree parameter
+        self.itemIndex = {}        # item text -> item, see FindItem()
+        self.root = None           # hidden root item, see GetRoot()
 
     def Create(self, parent):
         self.seltree = TreeCtrl(parent, style=wx.TR_HIDE_ROOT |
@@ -257,6 +536,10 @@ class ListCtrlComboPopup(ComboPopup):
     def GetStringValue(self):
         """Get value as a string separated by commas
         """
+        if not self.value:
+            return ''
+        if len(self.value) == 1:
+            return self.value[0]
         return ','.join(self.value)
 
     def SetStringValue(self, value):
@@ -295,7 +578,12 @@ class ListCtrlComboPopup(ComboPopup):
 
     def FindItem(self, parentItem, text, startLetters=False):
         """Finds item with given name or starting with given text
+
+        Items with given name are looked up in the whole tree.
         """
+        if not startLetters:
+            return self.itemIndex.get(text, wx.TreeItemId())
+
         startletters = startLetters
         item, cookie = self.seltree.GetFirstChild(parentItem)
         while wx.TreeItemId.IsOk(item):
@@ -310,18 +598,21 @@ class ListCtrlComboPopup(ComboPopup):
             item, cookie = self.seltree.GetNextChild(parentItem, cookie)
         return wx.TreeItemId()
 
+    def GetRoot(self):
+        """Get hidden root item, create it when needed"""
+        if not self.root:
+            self.root = self.seltree.AddRoot("<hidden root>")
+        return self.root
+
     def AddItem(self, value):
-        root = self.seltree.GetRootItem()
-        if not root:
-            root = self.seltree.AddRoot("<hidden root>")
-        self.seltree.AppendItem(root, text=value)
+        item = self.seltree.AppendItem(self.GetRoot(), text=value)
+        self.itemIndex.setdefault(value, item)
 
     def SetItems(self, items):
-        root = self.seltree.GetRootItem()
-        if not root:
-            root = self.seltree.AddRoot("<hidden root>")
-        for item in items:
-            self.seltree.AppendItem(root, text=item)
+        root = self.GetRoot()
+        for value in items:
+            item = self.seltree.AppendItem(root, text=value)
+            self.itemIndex.setdefault(value, item)
 
     def OnKeyUp(self, event):
         """Enable to select items using keyboard.
@@ -392,17 +683,19 @@ class ListCtrlComboPopup(ComboPopup):
         if 'onPopup' in kargs:
             self.onPopup = kargs['onPopup']
         if kargs.get('layerTree', None):
-            self.filterItems = []  # reset
+            self.filterItems = set()  # reset
             ltype = kargs['type']
             for layer in kargs['layerTree'].GetVisibleLayers(
                     skipDigitized=True):
                 if layer.GetType() != ltype:
                     continue
-                self.filterItems.append(layer.GetName())
+                self.filterItems.add(layer.GetName())
 
     def DeleteAllItems(self):
         """Delete all items in popup"""
         self.seltree.DeleteAllItems()
+        self.itemIndex.clear()
+        self.root = None
 
 
 class TreeCtrlComboPopup(ListCtrlComboPopup):
@@ -416,6 +709,7 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
         ListCtrlComboPopup.Init(self)
         self.nmaps = 1
         self.type = None
+        self.kinds = None   # g.list types of self.type
         self.mapsets = None
         self.onPopup = None
         self.fullyQualified = True
@@ -424,9 +718,23 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
         self.SetFilter(None)
         self.tgis_error = False
 
+        # pending request of _getElementListAsync()
+        self.requestId = None
+        # what the tree was built from, see _updateTree()
+        self.treeState = None
+        # GRASS database and location of elements in the tree
+        self.location = None
+
+    def Create(self, parent):
+        ListCtrlComboPopup.Create(self, parent)
+        self.seltree.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.OnItemExpanding)
+
+        return True
+
     def SetFilter(self, filter):
         """Set filter for GIS elements, see e.g. VectorSelect"""
         self.filterElements = filter
+        self.treeState = None
 
     def OnPopup(self, force=False):
         """Limited only for first selected"""
@@ -438,7 +746,11 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
             selected = None
             exclude = False
 
-        self.GetElementList(selected, exclude)
+        if self.type in ('stds', 'strds', 'str3ds', 'stvds'):
+            # temporal database connection is bound to the main thread
+            self.GetElementList(selected, exclude)
+        else:
+            self._getElementListAsync(selected, exclude)
 
         ListCtrlComboPopup.OnPopup(self, force)
 
@@ -447,11 +759,17 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
         and display as tree with all relevant elements displayed
         beneath each mapset branch
         """
+        self.requestId = None  # ignore pending _getElementListAsync()
         # update list
-        self.seltree.DeleteAllItems()
         if self.type:
             self._getElementList(self.type, self.mapsets, elements, exclude)
+        else:
+            self.DeleteAllItems()
+
+        self._selectValue()
 
+    def _selectValue(self):
+        """Select item of the first value in the tree"""
         if len(self.value) > 0:
             root = self.seltree.GetRootItem()
             if not root:
@@ -463,6 +781,46 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
             except:
                 pass
 
+    def _getElementListAsync(self, elements=None, exclude=False):
+        """Get list of GIS elements in a thread and display it when
+        done, see GetElementList()
+
+        Previous content of the tree is kept until the list is
+        available.
+        """
+        if not self.type:
+            self.DeleteAllItems()
+            return
+
+        if self.seltree.IsEmpty():
+            self.AddItem(_('Loading...'))
+
+        def fetch(element, kinds, mapsets):
+            try:
+                return self._fetchElements(element, kinds, mapsets)
+            except Exception as e:
+                # gThread does not handle exceptions, the thread would die
+                sys.stderr.write(_("GSelect: unable to list elements: %s") % e)
+                return [], {}, None, None
+
+        self.requestId = _getThread().Run(
+            callable=fetch,
+            element=self.type,
+            kinds=self.kinds,
+            mapsets=self.mapsets,
+            ondone=self._onElementsFetched,
+            userdata={'elements': elements, 'exclude': exclude})
+
+    def _onElementsFetched(self, event):
+        """List of GIS elements fetched in thread"""
+        if event.pid != self.requestId or not self.seltree:
+            return  # outdated request or destroyed widget
+
+        self._updateTree(event.ret, **event.userdata)
+        self._selectValue()
+
+        ListCtrlComboPopup.OnPopup(self, force=True)
+
     def _getElementList(self, element, mapsets=None,
                         elements=None, exclude=False):
         """Get list of GIS elements in accessible mapsets and display as tree
@@ -473,141 +831,343 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
         :param elements: list of forced GIS elements
         :param exclude: True to exclude, False for forcing the list (elements)
         """
-        # get current mapset
-        curr_mapset = grass.gisenv()['MAPSET']
-
-        # map element types to g.list types
-        elementdict = {'cell': 'raster',
-                       'raster': 'raster',
-                       'grid3': 'raster_3d',
-                       'raster_3d': 'raster_3d',
-                       'vector': 'vector',
-                       'paint/labels': 'label',
-                       'label': 'label',
-                       'windows': 'region',
-                       'region': 'region',
-                       'group': 'group',
-                       'stds': 'stds',
-                       'strds': 'strds',
-                       'str3ds': 'str3ds',
-                       'stvds': 'stvds'}
-
-        # to support multiple elements
-        element_list = element.split(',')
-        renamed_elements = []
-        for elem in element_list:
-            if elem not in elementdict:
-                self.AddItem(_('Not selectable element'), node=False)
-                return
+        if element == self.type:
+            kinds = self.kinds
+        else:
+            kinds = _getElementKinds(element)
+        self._updateTree(self._fetchElements(element, kinds, mapsets),
+                         elements, exclude)
+
+    def _updateTree(self, data, elements=None, exclude=False):
+        """Display GIS elements in the tree
+
+        When only lists of elements in some mapsets changed since the
+        tree was built, only these mapset branches are updated.
+
+        :param data: result of _fetchElements()
+        :param elements: list of forced GIS elements
+        :param exclude: True to exclude, False for forcing the list (elements)
+        """
+        if elements is not None:
+            elements = frozenset(elements)
+        if data is None:
+            key = filesdict = None
+        else:
+            mapsets, filesdict, curr_mapset, location = data
+            key = (mapsets, curr_mapset, location, elements, exclude,
+                   _CACHE_GENERATION)
+            self.location = location
+
+        self.seltree.Freeze()
+        try:
+            if key is None or not self.treeState or \
+                    self.treeState[0] != key or \
+                    not isinstance(filesdict, dict):
+                self.DeleteAllItems()
+                self._populateTree(data, elements, exclude)
+            else:
+                lastFilesdict = self.treeState[1]
+                for mapset in mapsets:
+                    if filesdict.get(mapset) != lastFilesdict.get(mapset):
+                        self._updateMapset(mapset, filesdict.get(mapset),
+                                           elements, exclude)
+        finally:
+            self.seltree.Thaw()
+
+        if key is not None:
+            self.treeState = (key, filesdict)
+
+    def _updateMapset(self, mapset, elem_list, elements, exclude):
+        """Replace elements in mapset branch
+
+        :param str mapset: mapset name
+        :param elem_list: new list (or dictionary) of elements
+        :param elements: set of forced GIS elements
+        :param exclude: True to exclude, False for forcing the list (elements)
+        """
+        mapset_node = self.itemIndex.get(_('Mapset') + ': ' + mapset)
+        if not mapset_node:
+            return
+        expanded = self.seltree.IsExpanded(mapset_node)
+        self._deleteChildren(mapset_node)
+
+        data = self.seltree.GetItemData(mapset_node)
+        data.pop('elements', None)
+        if not elem_list:
+            self.seltree.SetItemHasChildren(mapset_node, False)
+            return
+
+        data['elements'] = (elem_list, elements, exclude)
+        self.seltree.SetItemHasChildren(mapset_node, True)
+        if expanded:
+            self._populateMapset(mapset_node)
+            if self.seltree.ItemHasChildren(mapset_node):
+                self.seltree.ExpandAllChildren(mapset_node)
+
+    def _deleteChildren(self, parent):
+        """Delete children of given item and drop them from item index"""
+        item, cookie = self.seltree.GetFirstChild(parent)
+        while item.IsOk():
+            self._deleteChildren(item)
+            text = self.seltree.GetItemText(item)
+            data = self.seltree.GetItemData(item)
+            if data and data['mapset'] and not data['node']:
+                key = text + '@' + data['mapset']
             else:
-                renamed_elements.append(elementdict[elem])
+                key = text
+            if key in self.itemIndex and self.itemIndex[key] == item:
+                del self.itemIndex[key]
+            item, cookie = self.seltree.GetNextChild(parent, cookie)
+        self.seltree.DeleteChildren(parent)
+
+    def _fetchElements(self, element, kinds, mapsets=None):
+        """Get lists of GIS elements in accessible mapsets
+
+        Does not touch the tree, so it can run in a thread (except for
+        space-time datasets).
+
+        :param element: GIS element
+        :param kinds: g.list types of element (see _getElementKinds())
+        :param mapsets: list of acceptable mapsets (None for all mapsets in search path)
+
+        :return: tuple (list of mapsets, dictionary of mapsets/elements,
+                 current mapset, GRASS database and location) or None
+                 for not selectable element
+        """
+        if kinds is None:
+            return None
+
+        # get current mapset
+        gisenv = grass.gisenv()
+        curr_mapset = gisenv['MAPSET']
 
         if element in ('stds', 'strds', 'str3ds', 'stvds'):
             if not self.tgis_error:
                 import grass.temporal as tgis
-                filesdict = tgis.tlist_grouped(
-                    elementdict[element], element == 'stds')
+                filesdict = _sortGrouped(tgis.tlist_grouped(
+                    kinds[0], element == 'stds'))
             else:
                 filesdict = None
         else:
-            filesdict = grass.list_grouped(renamed_elements,
-                                           check_search_path=False)
+            filesdict = _listGrouped(kinds, gisenv)
+
+        # list of mapsets in current location
+        if mapsets is None:
+            mapsets = grass.mapsets(search_path=True)
+
+        # current mapset first
+        # (new list, given one can be shared, e.g. self.mapsets)
+        if curr_mapset in mapsets and mapsets[0] != curr_mapset:
+            mapsets = [curr_mapset] + \
+                [mapset for mapset in mapsets if mapset != curr_mapset]
+
+        location = _getLocation(gisenv)
+        if self.filterElements and kinds == ['vector'] and filesdict:
+            # vector maps are filtered by topology (see VectorSelect),
+            # get it for branches expanded when the tree is built here
+            # instead of in the main thread
+            sel = UserSettings.Get(
+                group='appearance',
+                key='elementListExpand',
+                subkey='selection')
+            for mapset in mapsets:
+                if not _isMapsetExpanded(sel, mapset, curr_mapset):
+                    continue
+                for name in filesdict.get(mapset, ()):
+                    try:
+                        _getVectorTopo(name + '@' + mapset, location)
+                    except Exception:
+                        pass  # reported when the map is filtered
+
+        return mapsets, filesdict, curr_mapset, location
+
+    def _populateTree(self, data, elements=None, exclude=False):
+        """Display GIS elements as tree with all relevant elements
+        displayed beneath each mapset branch
+
+        :param data: result of _fetchElements()
+        :param elements: set of forced GIS elements
+        :param exclude: True to exclude, False for forcing the list (elements)
+        """
+        if data is None:
+            self.AddItem(_('Not selectable element'), node=False)
+            return
+        mapsets, filesdict, curr_mapset, location = data
 
         # add extra items first
         if self.extraItems:
             for group, items in six.iteritems(self.extraItems):
                 node = self.AddItem(group, node=True)
-                self.seltree.SetItemTextColour(node, wx.Colour(50, 50, 200))
+                self.seltree.SetItemTextColour(node, _NODE_COLOUR)
                 for item in items:
                     self.AddItem(item, node=False, parent=node)
                 self.seltree.ExpandAllChildren(node)
 
-        # list of mapsets in current location
-        if mapsets is None:
-            mapsets = grass.mapsets(search_path=True)
-
-        # current mapset first
-        if curr_mapset in mapsets and mapsets[0] != curr_mapset:
-            mapsets.remove(curr_mapset)
-            mapsets.insert(0, curr_mapset)
+        sel = UserSettings.Get(
+            group='appearance',
+            key='elementListExpand',
+            subkey='selection')
 
         first_mapset = None
         for mapset in mapsets:
             mapset_node = self.AddItem(
                 _('Mapset') + ': ' + mapset, node=True, mapset=mapset)
-            node = mapset_node
             if not first_mapset:
                 first_mapset = mapset_node
 
-            self.seltree.SetItemTextColour(mapset_node, wx.Colour(50, 50, 200))
-            if mapset not in filesdict:
-                continue
-            try:
-                if isinstance(filesdict[mapset], dict):
-                    for elementType in filesdict[mapset].keys():
-                        node = self.AddItem(
-                            _('Type: ') + elementType,
-                            mapset=mapset,
-                            node=True,
-                            parent=mapset_node)
-                        self.seltree.SetItemTextColour(
-                            node, wx.Colour(50, 50, 200))
-                        elem_list = filesdict[mapset][elementType]
-                        self._addItems(
-                            elist=elem_list,
-                            elements=elements,
-                            mapset=mapset,
-                            exclude=exclude,
-                            node=node)
-                else:
-                    elem_list = filesdict[mapset]
-                    self._addItems(elist=elem_list, elements=elements,
-                                   mapset=mapset, exclude=exclude, node=node)
-            except Exception as e:
-                sys.stderr.write(_("GSelect: invalid item: %s") % e)
+            self.seltree.SetItemTextColour(mapset_node, _NODE_COLOUR)
+            if not filesdict or not filesdict.get(mapset):
                 continue
 
-            if self.seltree.ItemHasChildren(mapset_node):
-                sel = UserSettings.Get(
-                    group='appearance',
-                    key='elementListExpand',
-                    subkey='selection')
-                collapse = True
-
-                if sel == 0:  # collapse all except PERMANENT and current
-                    if mapset in ('PERMANENT', curr_mapset):
-                        collapse = False
-                elif sel == 1:  # collapse all except PERMANENT
-                    if mapset == 'PERMANENT':
-                        collapse = False
-                elif sel == 2:  # collapse all except current
-                    if mapset == curr_mapset:
-                        collapse = False
-                elif sel == 3:  # collapse all
-                    pass
-                elif sel == 4:  # expand all
-                    collapse = False
-
-                if collapse:
-                    self.seltree.CollapseAllChildren(mapset_node)
-                else:
+            # elements are added when the branch is expanded for the
+            # first time, see _populateMapset()
+            self.seltree.GetItemData(mapset_node)['elements'] = (
+                filesdict[mapset], elements, exclude)
+            self.seltree.SetItemHasChildren(mapset_node, True)
+
+            if _isMapsetExpanded(sel, mapset, curr_mapset):
+                self._populateMapset(mapset_node)
+                if self.seltree.ItemHasChildren(mapset_node):
                     self.seltree.ExpandAllChildren(mapset_node)
 
         if first_mapset:
             # select first mapset (MSW hack)
             self.seltree.SelectItem(first_mapset)
 
+    def _populateMapset(self, mapset_node):
+        """Add elements to mapset branch which was not populated yet
+
+        :param mapset_node: mapset node created by _getElementList()
+        """
+        data = self.seltree.GetItemData(mapset_node)
+        if not data or 'elements' not in data:
+            return
+        elem_list, elements, exclude = data.pop('elements')
+        mapset = data['mapset']
+
+        self.seltree.Freeze()
+        try:
+            if isinstance(elem_list, dict):
+                for elementType in elem_list.keys():
+                    node = self.AddItem(
+                        _('Type: ') + elementType,
+                        mapset=mapset,
+                        node=True,
+                        parent=mapset_node)
+                    self.seltree.SetItemTextColour(
+                        node, _NODE_COLOUR)
+                    self._addItems(
+                        elist=elem_list[elementType],
+                        elements=elements,
+                        mapset=mapset,
+                        exclude=exclude,
+                        node=node)
+            else:
+                self._addItems(elist=elem_list, elements=elements,
+                               mapset=mapset, exclude=exclude,
+                               node=mapset_node)
+        except Exception as e:
+            sys.stderr.write(_("GSelect: invalid item: %s") % e)
+        finally:
+            self.seltree.Thaw()
+
+        if not self.seltree.GetChildrenCount(mapset_node, recursively=False):
+            self.seltree.SetItemHasChildren(mapset_node, False)
+
+    def _populateMatching(self, parentItem, text, startLetters=False):
+        """Populate not yet expanded mapset branches which contain
+        element with given name or starting with given text
+
+        Only the branch of given mapset is populated for fully qualified
+        name and only the first branch containing the element for name
+        without mapset.
+
+        :param parentItem: mapset node or its parent
+        :param str text: element name (optionally fully qualified)
+        :param bool startLetters: True to match start of the name only
+        """
+        mapset = None
+        if '@' in text:
+            name, mapset = text.split('@', 1)
+        else:
+            name = text
+        if startLetters:
+            mapset = None  # mapset can be incomplete
+        items = [parentItem]
+        if parentItem == self.seltree.GetRootItem():
+            item, cookie = self.seltree.GetFirstChild(parentItem)
+            while item.IsOk():
+                items.append(item)
+                item, cookie = self.seltree.GetNextChild(parentItem, cookie)
+
+        for item in items:
+            data = self.seltree.GetItemData(item)
+            if not data or not data['mapset']:
+                continue
+            if mapset and data['mapset'] != mapset:
+                continue
+            if 'elements' in data:
+                elem_list = data['elements'][0]
+                if isinstance(elem_list, dict):
+                    elem_list = [elem for elist in elem_list.values()
+                                 for elem in elist]
+                for elem in elem_list:
+                    if elem == name or \
+                            (startLetters and elem.startswith(name)):
+                        self._populateMapset(item)
+                        break
+            if not startLetters and \
+                    name + '@' + data['mapset'] in self.itemIndex:
+                break  # found (not filtered out)
+
+    def FindItem(self, parentItem, text, startLetters=False):
+        """Finds item with given name or starting with given text
+
+        Mapset branches which were not expanded yet are populated
+        first when they contain the item.
+        """
+        self._populateMatching(parentItem, text, startLetters)
+        if not startLetters and '@' not in text:
+            item = self._findElement(text)
+            if item.IsOk():
+                return item
+        return ListCtrlComboPopup.FindItem(self, parentItem, text,
+                                           startLetters)
+
+    def _findElement(self, name):
+        """Find element given by name without mapset in the first
+        mapset (in order of the tree) which contains it
+        """
+        if self.root:
+            item, cookie = self.seltree.GetFirstChild(self.root)
+            while item.IsOk():
+                data = self.seltree.GetItemData(item)
+                if data and data['mapset']:
+                    found = self.itemIndex.get(name + '@' + data['mapset'])
+                    if found is not None:
+                        return found
+                item, cookie = self.seltree.GetNextChild(self.root, cookie)
+        return wx.TreeItemId()
+
+    def DeleteAllItems(self):
+        """Delete all items in popup"""
+        ListCtrlComboPopup.DeleteAllItems(self)
+        self.treeState = None
+
+    def OnItemExpanding(self, event):
+        """Populate mapset branch when expanded for the first time"""
+        self._populateMapset(event.GetItem())
+
     # helpers
     def _addItems(self, elist, elements, mapset, exclude, node):
         """Helper function for adding multiple items (maps, stds).
 
-        :param list elist: list of map/stds names
+        :param elist: sorted list of map/stds names
         :param list elements: list of forced elements
         :param str mapset:  mapset name
         :param exclude: True to exclude, False for forcing the list
         :param node: parent node
         """
-        elist = grass.natural_sort(elist)
         for elem in elist:
             if elem != '':
                 fullqElem = elem + '@' + mapset
@@ -628,15 +1188,17 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
 
     def AddItem(self, value, mapset=None, node=True, parent=None):
         if not parent:
-            root = self.seltree.GetRootItem()
-            if not root:
-                root = self.seltree.AddRoot("<hidden root>")
-            parent = root
+            parent = self.GetRoot()
 
         data = {'node': node, 'mapset': mapset}
 
         item = self.seltree.AppendItem(
             parent, text=value, data=data)
+        if mapset and not node:
+            # same name can be in more mapsets, see _findElement()
+            self.itemIndex.setdefault(value + '@' + mapset, item)
+        else:
+            self.itemIndex.setdefault(value, item)
         return item
 
     def OnKeyUp(self, event):
@@ -745,8 +1307,15 @@ class TreeCtrlComboPopup(ListCtrlComboPopup):
     def SetData(self, **kargs):
         """Set object properties"""
         ListCtrlComboPopup.SetData(self, **kargs)
+        self.treeState = None  # rebuild tree on next update
+        self.requestId = None  # ignore pending _getElementListAsync()
         if 'type' in kargs:
             self.type = kargs['type']
+            # resolve g.list types once, not on every popup
+            if self.type:
+                self.kinds = _getElementKinds(self.type)
+            else:
+                self.kinds = None
             if self.type in ('stds', 'strds', 'str3ds', 'stvds'):
                 # Initiate the temporal framework. Catch database error
                 # and set the error flag for the stds listing.
@@ -801,35 +1370,53 @@ class VectorDBInfo:
 
     def _CheckDBConnection(self):
         """Check DB connection"""
-        nuldev = open(os.devnull, 'w+')
         # if map is not defined (happens with vnet initialization) or it
         # doesn't exist
         try:
-            self.layers = grass.vector_db(map=self.map, stderr=nuldev)
+            self.layers = grass.vector_db(map=self.map, stderr=_DEVNULL)
         except CalledModuleError:
             return False
-        finally:  # always close nuldev
-            nuldev.close()
 
         return bool(len(self.layers.keys()) > 0)
 
     def _DescribeTables(self):
         """Describe linked tables"""
+        # describe each table once, tables of more layers in parallel
+        tables = set()
         for layer in self.layers.keys():
-            # determine column names and types
-            table = self.layers[layer]["table"]
-            columns = {}  # {name: {type, length, [values], [ids]}}
-            i = 0
             Debug.msg(
                 1,
                 "gselect.VectorDBInfo._DescribeTables(): table=%s driver=%s database=%s" %
                 (self.layers[layer]["table"],
                  self.layers[layer]["driver"],
                  self.layers[layer]["database"]))
-            for item in grass.db_describe(
-                    table=self.layers[layer]["table"],
-                    driver=self.layers[layer]["driver"],
-                    database=self.layers[layer]["database"])['cols']:
+            tables.add((self.layers[layer]["table"],
+                        self.layers[layer]["driver"],
+                        self.layers[layer]["database"]))
+        tables = list(tables)
+
+        def describe(args):
+            table, driver, database = args
+            return grass.db_describe(table=table, driver=driver,
+                                     database=database)
+
+        if len(tables) > 1:
+            pool = ThreadPool(min(8, len(tables)))
+            try:
+                descs = dict(zip(tables, pool.map(describe, tables)))
+            finally:
+                pool.close()
+        else:
+            descs = dict((args, describe(args)) for args in tables)
+
+        for layer in self.layers.keys():
+            # determine column names and types
+            table = self.layers[layer]["table"]
+            columns = {}  # {name: {type, length, [values], [ids]}}
+            i = 0
+            for item in descs[(table,
+                               self.layers[layer]["driver"],
+                               self.layers[layer]["database"])]['cols']:
                 name, type, length = item
                 # FIXME: support more datatypes
                 if type.lower() == "integer":
@@ -914,22 +1501,50 @@ class LayerSelect(wx.ComboBox):
         :param str vector: vector map name (native or connected via v.external)
         :param str dsn: OGR data source name
         """
+        self.all = all
+
+        # default value
+        self.default = default
+
+        value = ''
+        if not vector and not dsn:
+            # no layers to query, create widget with final items
+            # instead of calling InsertLayers()
+            choices = self._addDefaultLayers([])
+            if self.default and self.default in choices:
+                value = self.default
+
         super(
             LayerSelect,
             self).__init__(
             parent,
             id,
+            value=value,
             size=size,
             choices=choices)
 
-        self.all = all
-
         self.SetName("LayerSelect")
 
-        # default value
-        self.default = default
+        if vector or dsn:
+            self.InsertLayers(vector=vector, dsn=dsn)
+
+    def _addDefaultLayers(self, layers):
+        """Add default layer and layer for all features (-1) to the list
+
+        :param list layers: list of layers
+
+        :return: updated list of layers
+        """
+        if self.default:
+            if len(layers) == 0:
+                layers.insert(0, str(self.default))
+            elif self.default not in layers:
+                layers.append(self.default)
+
+        if self.all:
+            layers.insert(0, '-1')
 
-        self.InsertLayers(vector=vector, dsn=dsn)
+        return layers
 
     def InsertLayers(self, vector=None, dsn=None):
         """Insert layers for a vector into the layer combobox
@@ -950,14 +1565,7 @@ class LayerSelect(wx.ComboBox):
             if ret:
                 layers = ret.splitlines()
 
-        if self.default:
-            if len(layers) == 0:
-                layers.insert(0, str(self.default))
-            elif self.default not in layers:
-                layers.append(self.default)
-
-        if self.all:
-            layers.insert(0, '-1')
+        layers = self._addDefaultLayers(layers)
 
         if len(layers) > 0:
             self.SetItems(layers)
@@ -1022,31 +1630,70 @@ class TableSelect(wx.ComboBox):
             **kargs)
         self.SetName("TableSelect")
 
+        # pending request of InsertTables()
+        self.requestId = None
+
         if not choices:
             self.InsertTables()
 
     def InsertTables(self, driver=None, database=None):
-        """Insert attribute tables into combobox"""
+        """Insert attribute tables into combobox
+
+        Tables are listed in a thread, combobox is updated when done.
+        """
+        thread = _getThread()
+        # id of the request is known in thread to skip it when superseded
+        self.requestId = thread.GetId()
+        thread.Run(callable=self._getTables,
+                   requestId=self.requestId,
+                   driver=driver,
+                   database=database,
+                   ondone=self._onTablesFetched)
+
+    def _getTables(self, requestId, driver=None, database=None):
+        """Get list of attribute tables (called in thread)"""
         items = []
 
-        if not driver or not database:
-            connect = grass.db_connection()
+        try:
+            if requestId != self.requestId:
+                return None  # superseded by newer request
+
+            if not driver or not database:
+                connect = grass.db_connection()
+                if not connect:
+                    return items
 
-            driver = connect['driver']
-            database = connect['database']
+                driver = connect['driver']
+                database = connect['database']
 
-        ret = RunCommand('db.tables',
-                         flags='p',
-                         read=True,
-                         driver=driver,
-                         database=database)
+            ret = RunCommand('db.tables',
+                             flags='p',
+                             read=True,
+                             driver=driver,
+                             database=database)
+        except Exception as e:
+            # gThread does not handle exceptions, the thread would die
+            sys.stderr.write(_("GSelect: unable to list tables: %s") % e)
+            return items
 
         if ret:
             for table in ret.splitlines():
                 items.append(table)
 
-        self.SetItems(items)
-        self.SetValue('')
+        return items
+
+    def _onTablesFetched(self, event):
+        """List of attribute tables fetched in thread"""
+        if not self or event.pid != self.requestId:
+            return  # outdated request or destroyed widget
+
+        # keep table selected while the list was loading
+        value = self.GetValue()
+        self.SetItems(event.ret)
+        if value in event.ret:
+            self.SetValue(value)
+        else:
+            self.SetValue('')
 
 
 class ColumnSelect(ComboCtrl):
@@ -1071,6 +1718,8 @@ class ColumnSelect(ComboCtrl):
         self.defaultValue = value
         self.param = param
         self.columns = []
+        # pending request of InsertTableColumns()
+        self.requestId = None
 
         ComboCtrl.__init__(self, parent, id, size=size, **kwargs)
         self.GetChildren()[0].SetName("ColumnSelect")
@@ -1108,8 +1757,9 @@ class ColumnSelect(ComboCtrl):
         :param excludeCols: list of columns to be removed from the list
         :param type: only columns of given type (given as list)
         """
+        self.requestId = None  # ignore pending InsertTableColumns()
         if not dbInfo:
-            dbInfo = VectorDBInfo(vector)
+            dbInfo = _getVectorDBInfo(vector)
 
         try:
             try:
@@ -1120,22 +1770,18 @@ class ColumnSelect(ComboCtrl):
             table = dbInfo.GetTable(layer)
             columnchoices = dbInfo.GetTableDesc(table)
             keyColumn = dbInfo.GetKeyColumn(layer)
-            self.columns = len(columnchoices.keys()) * ['']
-            for key, val in six.iteritems(columnchoices):
-                self.columns[val['index']] = key
+            self.columns = [key for key, val in sorted(
+                six.iteritems(columnchoices),
+                key=lambda item: item[1]['index'])]
             if excludeKey:  # exclude key column
                 self.columns.remove(keyColumn)
-            if excludeCols:  # exclude key column
-                for key in six.iterkeys(columnchoices):
-                    if key in excludeCols:
-                        self.columns.remove(key)
+            if excludeCols:  # exclude given columns
+                excludeCols = set(excludeCols)
+                self.columns = [col for col in self.columns
+                                if col not in excludeCols]
             if type:  # only selected column types
-                for key, value in six.iteritems(columnchoices):
-                    if value['type'] not in type:
-                        try:
-                            self.columns.remove(key)
-                        except ValueError:
-                            pass
+                self.columns = [col for col in self.columns
+                                if columnchoices[col]['type'] in type]
         except (KeyError, ValueError, GException):
             self.columns[:] = []
 
@@ -1154,20 +1800,50 @@ class ColumnSelect(ComboCtrl):
     def InsertTableColumns(self, table, driver=None, database=None):
         """Insert table columns
 
+        Columns are listed in a thread, list is updated when done.
+
         :param str table: table name
         :param str driver: driver name
         :param str database: database name
         """
-        self.columns[:] = []
+        self.columns = []  # not known until columns are listed
+        thread = _getThread()
+        # id of the request is known in thread to skip it when superseded
+        self.requestId = thread.GetId()
+        thread.Run(callable=self._getTableColumns,
+                   requestId=self.requestId,
+                   table=table,
+                   driver=driver,
+                   database=database,
+                   ondone=self._onTableColumnsFetched)
+
+    def _getTableColumns(self, requestId, table, driver=None, database=None):
+        """Get list of table columns (called in thread)"""
+        try:
+            if requestId != self.requestId:
+                return None  # superseded by newer request
 
-        ret = RunCommand('db.columns',
-                         read=True,
-                         driver=driver,
-                         database=database,
-                         table=table)
+            ret = RunCommand('db.columns',
+                             read=True,
+                             driver=driver,
+                             database=database,
+                             table=table)
+        except Exception as e:
+            # gThread does not handle exceptions, the thread would die
+            sys.stderr.write(_("GSelect: unable to list columns: %s") % e)
+            return []
 
         if ret:
-            self.columns = ret.splitlines()
+            return ret.splitlines()
+
+        return []
+
+    def _onTableColumnsFetched(self, event):
+        """List of table columns fetched in thread"""
+        if not self or event.pid != self.requestId:
+            return  # outdated request or destroyed widget
+
+        self.columns = event.ret
 
         # update list
         self.tcp.DeleteAllItems()
@@ -1212,7 +1888,7 @@ class LocationSelect(wx.ComboBox):
         else:
             self.gisdbase = gisdbase
 
-        self.SetItems(GetListOfLocations(self.gisdbase))
+        self.SetItems(_getListOfLocations(self.gisdbase))
 
     def UpdateItems(self, dbase):
         """Update list of locations
@@ -1221,7 +1897,7 @@ class LocationSelect(wx.ComboBox):
         """
         self.gisdbase = dbase
         if dbase:
-            self.SetItems(GetListOfLocations(self.gisdbase))
+            self.SetItems(_getListOfLocations(self.gisdbase))
         else:
             self.SetItems([])
 
@@ -1295,8 +1971,7 @@ class MapsetSelect(wx.ComboBox):
                                read=True, flags='p',
                                sep='newline').splitlines()
         else:
-            mlist = GetListOfMapsets(self.gisdbase, self.location,
-                                     selectable=False)
+            mlist = _getListOfMapsets(self.gisdbase, self.location)
 
         gisenv = grass.gisenv()
         if self.skipCurrent and \
@@ -65,6 +65,7 @@ from lmgr.pyshell import PyShellWindow
 from lmgr.giface import LayerManagerGrassInterface
 from datacatalog.catalog import DataCatalog
 from gui_core.forms import GUI
+from gui_core import gselect
 from gui_core.wrap import Menu, TextEntryDialog
 
 
@@ -627,6 +628,8 @@ class GMFrame(wx.Frame):
                        parent=self,
                        mapset='%s' % ','.join(ms),
                        operation='set')
+            # lists of elements depend on mapset search path
+            gselect.InvalidateCache()
 
     def OnCBPageChanged(self, event):
         """Page in notebook (display) changed"""
@@ -21,6 +21,7 @@ from grass.pydispatch.signal import Signal
 
 from gui_core.toolbars import BaseToolbar, BaseIcons
 from gui_core.dialogs import CreateNewVector, VectorDialog
+from gui_core import gselect
 from gui_core.wrap import PseudoDC, Menu
 from vdigit.preferences import VDigitSettingsDialog
 from core.debug import Debug
@@ -1022,6 +1023,8 @@ class VDigitToolbar(BaseToolbar):
                                         "vector map <%s>...") %
                                       self.mapLayer.GetName(), 0)
             self.digit.CloseMap()
+            # feature types of the map may have changed
+            gselect.InvalidateCache()
 
             # close open background map if any
             bgMap = UserSettings.Get(